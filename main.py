@@ -5,231 +5,337 @@ Intelligent sourcing agent for cannabis industry supply chain management
 """
 
 import os
+import pathlib
 import sys
+import time
 import asyncio
 import argparse
+import hashlib
+import functools
+import importlib.util
+from datetime import datetime
 from typing import Dict, Any
 import logging
 
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from core.sourcing_agent import SourcingAgent
-# Add base-agent to path
-base_agent_path = os.path.join(os.path.dirname(__file__), 'base-agent')
-sys.path.append(base_agent_path)
-
-try:
-    from server import AgentServer
-except ImportError:
-    # Fallback for when base-agent is not available
-    class AgentServer:
-        def __init__(self, agent_name: str = "base-agent", port: int = 5000):
-            self.agent_name = agent_name
-            self.port = port
-            self.app = None
+_HERE = pathlib.Path(__file__).resolve().parent
+_SOURCES_DIR = _HERE / 'sources'
+_SOURCES_FILE = _SOURCES_DIR / 'sources.json'
+
+# Add base-agent to path (a git submodule, not an installable package)
+sys.path.append(str(_HERE / 'base-agent'))
+
+import msgspec
+import orjson
+
+logger = logging.getLogger(__name__)
+
+def require_package(module: str) -> bool:
+    """Check that a src/ module is installed, printing setup instructions if it is not"""
+    try:
+        found = importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        # The parent package (core or utils) is missing entirely
+        found = False
+    if not found:
+        print("❌ The sourcing agent packages are not installed.")
+        print("Run `pip install -e .` from the repository root first.")
+    return found
+
+def install_uvloop() -> bool:
+    """Use uvloop for asyncio event loops when it is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is not available on every platform (e.g. Windows)
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+# Bump whenever the knowledge base or prompts change to invalidate cached answers
+QUERY_CACHE_VERSION = '1'
+QUERY_CACHE_TTL = 3600
+QUERY_CACHE_DIR = str(_HERE / '.cache' / 'query_responses')
+
+_query_cache = None
+
+def get_query_cache():
+    """Open the on-disk query response cache on first use"""
+    global _query_cache
+    if _query_cache is None:
+        from diskcache import Cache
+        _query_cache = Cache(QUERY_CACHE_DIR, size_limit=2**30)
+    return _query_cache
+
+def query_cache_key(query: str) -> str:
+    """Build the cache key for a query (user_id is excluded so hits are shared across users)"""
+    normalized = query.strip().lower()
+    return hashlib.blake2b(f"{QUERY_CACHE_VERSION}|{normalized}".encode(), digest_size=16).hexdigest()
+
+async def cached_process_query(agent, user_id: str, query: str) -> Dict[str, Any]:
+    """Process a query, answering repeated questions from the response cache"""
+    # diskcache is synchronous SQLite I/O, so keep it off the shared event loop
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    key = query_cache_key(query)
+    try:
+        cache = await loop.run_in_executor(None, get_query_cache)
+        cached = await loop.run_in_executor(None, cache.get, key)
+    except Exception as e:
+        # The cache is only an optimization; answer live if it is unavailable
+        logger.warning("Query cache read failed: %s", e)
+        cache = cached = None
+    if cached is not None:
+        logger.debug("Query cache hit for %s", key)
+        # Cached answers are shared across users, so restamp the per-request fields
+        response = dict(cached)
+        if 'user_id' in response:
+            response['user_id'] = user_id
+        response['response_time'] = time.perf_counter() - start
+        return response
+    
+    response = await agent.process_query(user_id, query)
+    logger.debug("Response for %s: %s", user_id, response)
+    if cache is not None and isinstance(response, dict) and 'error' not in response:
+        try:
+            await loop.run_in_executor(
+                None, functools.partial(cache.set, key, response, expire=QUERY_CACHE_TTL)
+            )
+        except Exception as e:
+            logger.warning("Query cache write failed: %s", e)
+    return response
+
+def encode_json(payload: Any) -> bytes:
+    """Serialize a response payload with orjson, stringifying types it does not know"""
+    return orjson.dumps(payload, default=str)
+
+def json_response(payload: Any, status_code: int = 200):
+    """Build a JSON response directly, skipping FastAPI's jsonable_encoder pass"""
+    from fastapi import Response
+    
+    body = payload if isinstance(payload, bytes) else encode_json(payload)
+    return Response(body, status_code=status_code, media_type='application/json')
+
+def _compute_source_metrics(sources_file: pathlib.Path, sources_dir: pathlib.Path) -> Dict[str, Any]:
+    """Aggregate dashboard metrics from the sources database"""
+    metrics = {
+        'total_sources': 0,
+        'preferred_sources': 0,
+        'states_covered': 0,
+        'dispensaries': 0,
+        'suppliers': 0,
+        'manufacturers': 0,
+        'testing_labs': 0,
+        'recreational_medical': 0,
+        'medical_only': 0,
+        'last_scrape': None,
+        'last_update': None,
+        'preferred_sources_list': []
+    }
+    try:
+        with open(sources_file, 'rb') as f:
+            data = orjson.loads(f.read())
         
-        def run(self, debug: bool = False):
-            print(f"Mock server for {self.agent_name} on port {self.port}")
-            print("Base agent server not available - using mock implementation")
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        preferred = data.get('preferred_sources') or []
+        sources_by_state = data.get('sources_by_state') or {}
+        national = data.get('national_suppliers') or {}
+        
+        # Count sources by state and type in a single pass
+        dispensaries = 0
+        manufacturers = 0
+        recreational_medical = 0
+        medical_only = 0
+        for state_data in sources_by_state.values():
+            legal_status = state_data.get('legal_status')
+            if legal_status == 'recreational_medical':
+                recreational_medical += 1
+            elif legal_status == 'medical_only':
+                medical_only += 1
+            dispensaries += len(state_data.get('dispensaries') or ())
+            manufacturers += len(state_data.get('manufacturers') or ())
+        
+        # National equipment/packaging suppliers and consulting services count as suppliers
+        suppliers = len(data.get('consulting_services') or ())
+        for category in ('equipment', 'packaging'):
+            suppliers += len(national.get(category) or ())
+        testing_labs = len(national.get('testing') or ())
+        
+        metrics['total_sources'] = len(preferred) + dispensaries + manufacturers + suppliers + testing_labs
+        metrics['preferred_sources'] = len(preferred)
+        metrics['preferred_sources_list'] = preferred
+        metrics['states_covered'] = len(sources_by_state)
+        metrics['dispensaries'] = dispensaries
+        metrics['suppliers'] = suppliers
+        metrics['manufacturers'] = manufacturers
+        metrics['testing_labs'] = testing_labs
+        metrics['recreational_medical'] = recreational_medical
+        metrics['medical_only'] = medical_only
+        metrics['last_update'] = data.get('metadata', {}).get('last_updated', 'Unknown')
+        
+    except Exception as e:
+        metrics['error'] = str(e)
+    
+    # Find last scrape file with a single stat per directory entry
+    try:
+        latest_mtime = 0.0
+        with os.scandir(sources_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('scraped_data_') and name.endswith('.json'):
+                    mtime = entry.stat().st_mtime
+                    if mtime > latest_mtime:
+                        latest_mtime = mtime
+        if latest_mtime:
+            metrics['last_scrape'] = datetime.fromtimestamp(latest_mtime).strftime('%Y-%m-%d %H:%M')
+    except Exception as e:
+        metrics['last_scrape'] = None
+    
+    return metrics
+
+@functools.lru_cache(maxsize=4)
+def _cached_source_metrics_json(sources_file: pathlib.Path, sources_dir: pathlib.Path,
+                                sources_mtime_ns: int, dir_mtime_ns: int) -> bytes:
+    """Memoize the encoded metrics on the sources file and directory modification times"""
+    return encode_json(_compute_source_metrics(sources_file, sources_dir))
+
+def _source_metrics_key(sources_file: pathlib.Path, sources_dir: pathlib.Path):
+    """Build the memoization key for source metrics, or None if the files cannot be read"""
+    try:
+        return (sources_file, sources_dir, os.stat(sources_file).st_mtime_ns, os.stat(sources_dir).st_mtime_ns)
+    except OSError:
+        return None
+
+def get_source_metrics_json(sources_file: pathlib.Path = _SOURCES_FILE,
+                            sources_dir: pathlib.Path = _SOURCES_DIR) -> bytes:
+    """Get source metrics as JSON, recomputing only when sources.json or its directory changes"""
+    key = _source_metrics_key(sources_file, sources_dir)
+    if key is None:
+        # Missing files are reported through the uncached error path
+        return encode_json(_compute_source_metrics(sources_file, sources_dir))
+    return _cached_source_metrics_json(*key)
+
+class QueryRequest(msgspec.Struct):
+    """Request body for /api/query"""
+    query: str
+    user_id: str = 'anonymous'
+
+# (path, getter name, description) for the read-only knowledge base endpoints
+READ_ENDPOINTS = (
+    ('/api/supplier-categories', 'get_supplier_categories', 'supplier categories'),
+    ('/api/quality-standards', 'get_quality_standards', 'quality standards'),
+    ('/api/sourcing-strategies', 'get_sourcing_strategies', 'sourcing strategies'),
+    ('/api/compliance-requirements', 'get_compliance_requirements', 'compliance requirements'),
+    ('/api/agent-status', 'get_agent_status', 'agent status'),
 )
-logger = logging.getLogger(__name__)
 
-class SourcingAgentServer(AgentServer):
-    """Extended server for sourcing agent with additional endpoints"""
+class SourcingAgentServer:
+    """ASGI server for the sourcing agent with additional endpoints"""
     
     def __init__(self, agent_name: str = "sourcing-agent", port: int = 5000):
-        super().__init__(agent_name, port)
+        from core.sourcing_agent import SourcingAgent
+        from fastapi import FastAPI
+        
+        self.agent_name = agent_name
+        self.port = port
         self.sourcing_agent = SourcingAgent()
+        self.cached_getters = []
+        self.app = FastAPI(title="Formul8 Sourcing Agent")
         self.setup_sourcing_routes()
+        self.mount_dashboard()
+        self.warm_cache()
     
-    def setup_sourcing_routes(self):
-        """Setup sourcing-specific routes"""
-        
-        @self.app.route('/api/supplier-categories')
-        def get_supplier_categories():
-            """Get all supplier categories from knowledge base"""
+    def warm_cache(self):
+        """Populate the cached knowledge base endpoints before serving"""
+        # One at a time: the getters share one rdflib Graph, which is not documented as thread-safe
+        for getter in self.cached_getters:
             try:
-                categories = self.sourcing_agent.knowledge_base.get_supplier_categories()
-                return self.app.jsonify(categories)
+                getter()
             except Exception as e:
-                logger.error(f"Error getting supplier categories: {e}")
-                return self.app.jsonify({'error': str(e)}), 500
+                # Left uncached; the endpoint reports the error on first request
+                logger.warning("Knowledge base warm-up failed: %s", e)
+    
+    def mount_dashboard(self):
+        """Serve the base-agent dashboard under the ASGI app when available"""
+        try:
+            from server import AgentServer
+        except ImportError:
+            # Fallback for when base-agent is not available
+            logger.info("Base agent server not available - dashboard disabled")
+            return
+        from a2wsgi import WSGIMiddleware
         
-        @self.app.route('/api/quality-standards')
-        def get_quality_standards():
-            """Get quality standards from knowledge base"""
-            try:
-                standards = self.sourcing_agent.knowledge_base.get_quality_standards()
-                return self.app.jsonify(standards)
-            except Exception as e:
-                logger.error(f"Error getting quality standards: {e}")
-                return self.app.jsonify({'error': str(e)}), 500
+        base_server = AgentServer(self.agent_name, self.port)
+        if base_server.app is not None:
+            self.app.mount('/', WSGIMiddleware(base_server.app))
+    
+    def _make_read_handler(self, method_name: str, description: str):
+        """Build a GET handler that returns the JSON-encoded result of a read-only getter"""
+        if method_name == 'get_agent_status':
+            # Status carries a last-updated timestamp, so it is never cached
+            getter = lambda: encode_json(self.sourcing_agent.get_agent_status())
+        else:
+            # Knowledge base contents are static for the lifetime of the process,
+            # so the encoded body is cached rather than re-serialized per request
+            kb_getter = getattr(self.sourcing_agent.knowledge_base, method_name)
+            getter = functools.lru_cache(maxsize=1)(lambda: encode_json(kb_getter()))
+            self.cached_getters.append(getter)
         
-        @self.app.route('/api/sourcing-strategies')
-        def get_sourcing_strategies():
-            """Get sourcing strategies from knowledge base"""
+        def handler():
             try:
-                strategies = self.sourcing_agent.knowledge_base.get_sourcing_strategies()
-                return self.app.jsonify(strategies)
+                return json_response(getter())
             except Exception as e:
-                logger.error(f"Error getting sourcing strategies: {e}")
-                return self.app.jsonify({'error': str(e)}), 500
+                logger.error("Error getting %s: %s", description, e)
+                return json_response({'error': str(e)}, status_code=500)
         
-        @self.app.route('/api/compliance-requirements')
-        def get_compliance_requirements():
-            """Get compliance requirements from knowledge base"""
-            try:
-                requirements = self.sourcing_agent.knowledge_base.get_compliance_requirements()
-                return self.app.jsonify(requirements)
-            except Exception as e:
-                logger.error(f"Error getting compliance requirements: {e}")
-                return self.app.jsonify({'error': str(e)}), 500
+        handler.__doc__ = f"Get {description}"
+        return handler
+    
+    def setup_sourcing_routes(self):
+        """Setup sourcing-specific routes"""
+        from fastapi import Request
         
-        @self.app.route('/api/agent-status')
-        def get_agent_status():
-            """Get detailed agent status and capabilities"""
-            try:
-                status = self.sourcing_agent.get_agent_status()
-                return self.app.jsonify(status)
-            except Exception as e:
-                logger.error(f"Error getting agent status: {e}")
-                return self.app.jsonify({'error': str(e)}), 500
+        for path, method_name, description in READ_ENDPOINTS:
+            self.app.add_api_route(path, self._make_read_handler(method_name, description), methods=['GET'], name=method_name)
         
-        @self.app.route('/api/query', methods=['POST'])
-        def process_query():
+        @self.app.post('/api/query')
+        async def process_query(request: Request):
             """Process a sourcing query"""
             try:
-                data = self.app.request.get_json()
-                if not data or 'query' not in data:
-                    return self.app.jsonify({'error': 'Query is required'}), 400
+                try:
+                    body = msgspec.json.decode(await request.body(), type=QueryRequest)
+                except msgspec.DecodeError as e:
+                    return json_response({'error': str(e)}, status_code=400)
                 
-                user_id = data.get('user_id', 'anonymous')
-                query = data['query']
-                
-                # Process query asynchronously
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                response = loop.run_until_complete(
-                    self.sourcing_agent.process_query(user_id, query)
-                )
-                loop.close()
-                
-                return self.app.jsonify(response)
+                # Runs on the server's shared event loop
+                response = await cached_process_query(self.sourcing_agent, body.user_id, body.query)
+                return json_response(response)
             except Exception as e:
-                logger.error(f"Error processing query: {e}")
-                return self.app.jsonify({'error': str(e)}), 500
+                logger.error("Error processing query: %s", e)
+                return json_response({'error': str(e)}, status_code=500)
 
-        @self.app.route('/api/source-metrics')
-        def get_source_metrics():
+        @self.app.get('/api/source-metrics')
+        def source_metrics():
             """Get enhanced source metrics for dashboard"""
-            import json
-            import glob
-            import os
-            from datetime import datetime
-            sources_file = os.path.join(os.path.dirname(__file__), 'sources', 'sources.json')
-            metrics = {
-                'total_sources': 0,
-                'preferred_sources': 0,
-                'states_covered': 0,
-                'dispensaries': 0,
-                'suppliers': 0,
-                'manufacturers': 0,
-                'testing_labs': 0,
-                'recreational_medical': 0,
-                'medical_only': 0,
-                'last_scrape': None,
-                'last_update': None,
-                'preferred_sources_list': []
-            }
-            try:
-                with open(sources_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Count preferred sources
-                if data.get('preferred_sources'):
-                    metrics['preferred_sources'] = len(data['preferred_sources'])
-                    metrics['preferred_sources_list'] = data['preferred_sources']
-                
-                # Count sources by state and type
-                total = metrics['preferred_sources']
-                states = set()
-                dispensaries = 0
-                suppliers = 0
-                manufacturers = 0
-                testing_labs = 0
-                recreational_medical = 0
-                medical_only = 0
-                
-                if data.get('sources_by_state'):
-                    for state, state_data in data['sources_by_state'].items():
-                        states.add(state)
-                        
-                        # Count legal status
-                        if state_data.get('legal_status') == 'recreational_medical':
-                            recreational_medical += 1
-                        elif state_data.get('legal_status') == 'medical_only':
-                            medical_only += 1
-                        
-                        # Count dispensaries
-                        if state_data.get('dispensaries'):
-                            dispensaries += len(state_data['dispensaries'])
-                            total += len(state_data['dispensaries'])
-                        
-                        # Count manufacturers
-                        if state_data.get('manufacturers'):
-                            manufacturers += len(state_data['manufacturers'])
-                            total += len(state_data['manufacturers'])
-                
-                # Count national suppliers
-                if data.get('national_suppliers'):
-                    if data['national_suppliers'].get('equipment'):
-                        suppliers += len(data['national_suppliers']['equipment'])
-                        total += len(data['national_suppliers']['equipment'])
-                    if data['national_suppliers'].get('packaging'):
-                        suppliers += len(data['national_suppliers']['packaging'])
-                        total += len(data['national_suppliers']['packaging'])
-                    if data['national_suppliers'].get('testing'):
-                        testing_labs += len(data['national_suppliers']['testing'])
-                        total += len(data['national_suppliers']['testing'])
-                
-                # Count consulting services
-                if data.get('consulting_services'):
-                    suppliers += len(data['consulting_services'])
-                    total += len(data['consulting_services'])
-                
-                metrics['total_sources'] = total
-                metrics['states_covered'] = len(states)
-                metrics['dispensaries'] = dispensaries
-                metrics['suppliers'] = suppliers
-                metrics['manufacturers'] = manufacturers
-                metrics['testing_labs'] = testing_labs
-                metrics['recreational_medical'] = recreational_medical
-                metrics['medical_only'] = medical_only
-                metrics['last_update'] = data.get('metadata', {}).get('last_updated', 'Unknown')
-                
-            except Exception as e:
-                metrics['error'] = str(e)
-            
-            # Find last scrape file
-            try:
-                scrape_files = glob.glob(os.path.join(os.path.dirname(__file__), 'sources', 'scraped_data_*.json'))
-                if scrape_files:
-                    latest = max(scrape_files, key=os.path.getmtime)
-                    ts = os.path.getmtime(latest)
-                    metrics['last_scrape'] = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M')
-            except Exception as e:
-                metrics['last_scrape'] = None
-            
-            return self.app.jsonify(metrics)
+            return json_response(get_source_metrics_json())
+
+    def run(self, debug: bool = False):
+        """Serve the app with uvicorn on a uvloop event loop"""
+        import uvicorn
+        
+        uvicorn.run(
+            self.app,
+            host='0.0.0.0',
+            port=self.port,
+            loop='uvloop' if install_uvloop() else 'asyncio',
+            http='httptools',
+            log_level='debug' if debug else 'info'
+        )
+
+QUIT_COMMANDS = frozenset(('quit', 'exit', 'q'))
 
 def run_cli_mode():
     """Run the sourcing agent in CLI mode"""
+    from core.sourcing_agent import SourcingAgent
+    
     agent = SourcingAgent()
     
     print("🌿 Formul8 Sourcing Agent - CLI Mode")
@@ -237,53 +343,60 @@ def run_cli_mode():
     print("Type 'help' for available commands, 'quit' to exit")
     print()
     
-    while True:
-        try:
-            user_input = input("sourcing-agent> ").strip()
-            
-            if user_input.lower() in ['quit', 'exit', 'q']:
-                print("Goodbye! 👋")
-                break
-            elif user_input.lower() == 'help':
-                print_help()
-            elif user_input.lower() == 'status':
-                status = agent.get_agent_status()
-                print_agent_status(status)
-            elif user_input.lower() == 'categories':
-                categories = agent.knowledge_base.get_supplier_categories()
-                print_supplier_categories(categories)
-            elif user_input.lower() == 'standards':
-                standards = agent.knowledge_base.get_quality_standards()
-                print_quality_standards(standards)
-            elif user_input.lower() == 'strategies':
-                strategies = agent.knowledge_base.get_sourcing_strategies()
-                print_sourcing_strategies(strategies)
-            elif user_input.lower() == 'compliance':
-                requirements = agent.knowledge_base.get_compliance_requirements()
-                print_compliance_requirements(requirements)
-            elif user_input:
-                # Process as a query
-                print("Processing query...")
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                response = loop.run_until_complete(
-                    agent.process_query('cli_user', user_input)
-                )
-                loop.close()
-                
-                print(f"\nResponse: {response['response']}")
-                print(f"Confidence: {response['confidence']:.2f}")
-                print(f"Response Time: {response['response_time']:.2f}s")
-                print()
-            else:
-                continue
+    # Knowledge base contents are static for the lifetime of the process
+    kb = agent.knowledge_base
+    cached_categories = functools.lru_cache(maxsize=1)(kb.get_supplier_categories)
+    cached_standards = functools.lru_cache(maxsize=1)(kb.get_quality_standards)
+    cached_strategies = functools.lru_cache(maxsize=1)(kb.get_sourcing_strategies)
+    cached_compliance = functools.lru_cache(maxsize=1)(kb.get_compliance_requirements)
+    handlers = {
+        'help': print_help,
+        'status': lambda: print_agent_status(agent.get_agent_status()),
+        'categories': lambda: print_supplier_categories(cached_categories()),
+        'standards': lambda: print_quality_standards(cached_standards()),
+        'strategies': lambda: print_sourcing_strategies(cached_strategies()),
+        'compliance': lambda: print_compliance_requirements(cached_compliance()),
+    }
+    
+    # One event loop for the whole session instead of one per query
+    install_uvloop()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    
+    try:
+        while True:
+            try:
+                user_input = input("sourcing-agent> ").strip()
                 
-        except KeyboardInterrupt:
-            print("\nGoodbye! 👋")
-            break
-        except Exception as e:
-            logger.error(f"Error in CLI mode: {e}")
-            print(f"Error: {e}")
+                command = user_input.lower()
+                handler = handlers.get(command)
+                if handler:
+                    handler()
+                elif command in QUIT_COMMANDS:
+                    print("Goodbye! 👋")
+                    break
+                elif user_input:
+                    # Process as a query
+                    print("Processing query...")
+                    response = loop.run_until_complete(
+                        agent.process_query('cli_user', user_input)
+                    )
+                    
+                    print(f"\nResponse: {response['response']}")
+                    print(f"Confidence: {response['confidence']:.2f}")
+                    print(f"Response Time: {response['response_time']:.2f}s")
+                    print()
+                else:
+                    continue
+                    
+            except KeyboardInterrupt:
+                print("\nGoodbye! 👋")
+                break
+            except Exception as e:
+                logger.error("Error in CLI mode: %s", e)
+                print(f"Error: {e}")
+    finally:
+        loop.close()
 
 def print_help():
     """Print help information"""
@@ -321,49 +434,53 @@ def print_agent_status(status: Dict[str, Any]):
 
 def print_supplier_categories(categories: list):
     """Print supplier categories in a formatted way"""
-    print(f"\n🏗️ Supplier Categories ({len(categories)}):")
+    lines = [f"\n🏗️ Supplier Categories ({len(categories)}):"]
     for category in categories:
-        print(f"\n  📋 {category['label']}")
+        lines.append(f"\n  📋 {category['label']}")
         if category['products']:
-            print(f"     Products: {', '.join(category['products'])}")
+            lines.append(f"     Products: {', '.join(category['products'])}")
         if category['qualifications']:
-            print(f"     Qualifications: {', '.join(category['qualifications'])}")
+            lines.append(f"     Qualifications: {', '.join(category['qualifications'])}")
         if category['certifications']:
-            print(f"     Certifications: {', '.join(category['certifications'])}")
-    print()
+            lines.append(f"     Certifications: {', '.join(category['certifications'])}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def print_quality_standards(standards: list):
     """Print quality standards in a formatted way"""
-    print(f"\n📊 Quality Standards ({len(standards)}):")
+    lines = [f"\n📊 Quality Standards ({len(standards)}):"]
     for standard in standards:
-        print(f"\n  ✅ {standard['label']}")
+        lines.append(f"\n  ✅ {standard['label']}")
         if standard['criteria']:
-            print(f"     Criteria: {', '.join(standard['criteria'])}")
+            lines.append(f"     Criteria: {', '.join(standard['criteria'])}")
         if standard['testing']:
-            print(f"     Testing: {', '.join(standard['testing'])}")
-    print()
+            lines.append(f"     Testing: {', '.join(standard['testing'])}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def print_sourcing_strategies(strategies: list):
     """Print sourcing strategies in a formatted way"""
-    print(f"\n🎯 Sourcing Strategies ({len(strategies)}):")
+    lines = [f"\n🎯 Sourcing Strategies ({len(strategies)}):"]
     for strategy in strategies:
-        print(f"\n  🎯 {strategy['label']}")
+        lines.append(f"\n  🎯 {strategy['label']}")
         if strategy['advantages']:
-            print(f"     Advantages: {', '.join(strategy['advantages'])}")
+            lines.append(f"     Advantages: {', '.join(strategy['advantages'])}")
         if strategy['benefits']:
-            print(f"     Benefits: {', '.join(strategy['benefits'])}")
-    print()
+            lines.append(f"     Benefits: {', '.join(strategy['benefits'])}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def print_compliance_requirements(requirements: list):
     """Print compliance requirements in a formatted way"""
-    print(f"\n⚖️ Compliance Requirements ({len(requirements)}):")
+    lines = [f"\n⚖️ Compliance Requirements ({len(requirements)}):"]
     for requirement in requirements:
-        print(f"\n  📋 {requirement['label']}")
+        lines.append(f"\n  📋 {requirement['label']}")
         if requirement['regulations']:
-            print(f"     Regulations: {', '.join(requirement['regulations'])}")
+            lines.append(f"     Regulations: {', '.join(requirement['regulations'])}")
         if requirement['documentation']:
-            print(f"     Documentation: {', '.join(requirement['documentation'])}")
-    print()
+            lines.append(f"     Documentation: {', '.join(requirement['documentation'])}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main entry point"""
@@ -406,22 +523,25 @@ Examples:
     
     args = parser.parse_args()
     
-    # Set debug level
-    if args.debug:
-        logging.getLogger().setLevel(logging.DEBUG)
+    # Configure logging here rather than at import so importing main stays side-effect free
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    if not require_package('core.sourcing_agent'):
+        sys.exit(1)
     
     try:
         if args.query:
             # Process single query
+            from core.sourcing_agent import SourcingAgent
+            
+            install_uvloop()
             agent = SourcingAgent()
             print(f"Processing query: {args.query}")
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            response = loop.run_until_complete(
-                agent.process_query('cli_user', args.query)
-            )
-            loop.close()
+            response = asyncio.run(cached_process_query(agent, 'cli_user', args.query))
             
             print(f"\nResponse: {response['response']}")
             print(f"Confidence: {response['confidence']:.2f}")
@@ -442,7 +562,7 @@ Examples:
     except KeyboardInterrupt:
         print("\nShutting down...")
     except Exception as e:
-        logger.error(f"Error in main: {e}")
+        logger.error("Error in main: %s", e)
         print(f"Error: {e}")
         sys.exit(1)
 
@@ -8,79 +8,148 @@ import asyncio
 import argparse
 import sys
 import os
-from datetime import datetime
+import time
+import pathlib
 
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+import ijson
 
-from utils.scraper import CannabisSourceScraper
+_SOURCES_FILE = pathlib.Path(__file__).resolve().parent / 'sources' / 'sources.json'
+
+# Requests are not yet limited per host, so the default stays close to the old 5
+DEFAULT_MAX_CONCURRENT = 8
+
+def default_max_concurrent():
+    """Pick a modest request concurrency that stays inside the open file limit"""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError, ValueError):
+        # resource is unavailable on Windows
+        return DEFAULT_MAX_CONCURRENT
+    if soft == resource.RLIM_INFINITY:
+        return DEFAULT_MAX_CONCURRENT
+    # Leave ~50 descriptors for the process itself, then 4 per in-flight request
+    return min(DEFAULT_MAX_CONCURRENT, max(1, (soft - 50) // 4))
+
+def effective_max_concurrent(max_concurrent, total_sources):
+    """Clamp the requested concurrency: no point holding more slots than sources"""
+    return max(1, min(max_concurrent, total_sources))
+
+def _stream_items(sources_file, prefix):
+    """Stream the JSON values under prefix without loading the whole file"""
+    with open(sources_file, 'rb') as f:
+        yield from ijson.items(f, prefix)
+
+def _stream_states(sources_file):
+    """Stream (state, state_data) pairs from sources_by_state one state at a time"""
+    with open(sources_file, 'rb') as f:
+        yield from ijson.kvitems(f, 'sources_by_state')
+
+# ijson prefixes whose array items are scrapeable sources, besides
+# sources_by_state.<state>.materials/equipment.item
+_SOURCE_ITEM_PREFIXES = frozenset((
+    'preferred_sources.item',
+    'national_suppliers.materials.item',
+    'national_suppliers.equipment.item',
+))
+_STATE_ITEM_SUFFIXES = ('.materials.item', '.equipment.item')
+# Events that open an array item (map_key/end_* events share the item's prefix)
+_ITEM_START_EVENTS = frozenset(('start_map', 'start_array', 'string', 'number', 'boolean', 'null'))
+
+def count_sources(sources_file):
+    """Count scrapeable sources in one streaming pass without building any of them"""
+    total_sources = 0
+    with open(sources_file, 'rb') as f:
+        for prefix, event, _ in ijson.parse(f):
+            if event not in _ITEM_START_EVENTS:
+                continue
+            if prefix in _SOURCE_ITEM_PREFIXES:
+                total_sources += 1
+            elif (prefix.startswith('sources_by_state.') and prefix.endswith(_STATE_ITEM_SUFFIXES)
+                  and prefix.count('.') == 3):
+                total_sources += 1
+    return total_sources
+
+def _iter_source_buckets(sources_data):
+    """Yield every list of scrapeable sources from loaded sources data"""
+    yield sources_data.get('preferred_sources') or ()
+    
+    for state_data in (sources_data.get('sources_by_state') or {}).values():
+        yield state_data.get('materials') or ()
+        yield state_data.get('equipment') or ()
+    
+    national = sources_data.get('national_suppliers') or {}
+    yield national.get('materials') or ()
+    yield national.get('equipment') or ()
+
+def count_loaded_sources(sources_data):
+    """Count scrapeable sources in already-loaded sources data"""
+    return sum(map(len, _iter_source_buckets(sources_data)))
+
+def print_dry_run(sources_file):
+    """Print the sources that would be scraped, streaming them from disk"""
+    lines = ["DRY RUN MODE - No actual scraping will be performed", "Sources that would be scraped:"]
+    
+    # Show sources that would be scraped
+    for i, source in enumerate(_stream_items(sources_file, 'preferred_sources.item')):
+        if i == 0:
+            lines.append("\nPreferred Sources:")
+        lines.append(f"  ⭐ {source['name']} - {source['url']}")
+    sys.stdout.write("\n".join(lines) + "\n")
+    
+    # One write per state keeps output flowing while the file streams
+    for i, (state, state_data) in enumerate(_stream_states(sources_file)):
+        lines = ["\nState Sources:"] if i == 0 else []
+        lines.append(f"\n  {state.upper()}:")
+        for source in state_data.get('materials') or ():
+            lines.append(f"    📦 {source['name']} - {source['url']}")
+        for source in state_data.get('equipment') or ():
+            lines.append(f"    🔧 {source['name']} - {source['url']}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 async def scrape_sources(args):
     """Main scraping function"""
-    scraper = CannabisSourceScraper(args.sources_file)
+    scraper = None
     
     try:
         print("🌿 Cannabis Source Scraper")
         print("=" * 50)
         print(f"Sources file: {args.sources_file}")
-        print(f"Max concurrent: {args.max_concurrent}")
         print(f"Output file: {args.output_file}")
-        print()
         
-        # Load sources to show count
-        sources_data = scraper.sources_data
-        total_sources = 0
+        if args.dry_run:
+            # Stream the file instead of loading it just to list it
+            total_sources = count_sources(args.sources_file)
+            print(f"Max concurrent: {effective_max_concurrent(args.max_concurrent, total_sources)}")
+            print()
+            print(f"Found {total_sources} sources to scrape")
+            print()
+            print_dry_run(args.sources_file)
+            return
         
-        if sources_data.get('preferred_sources'):
-            total_sources += len(sources_data['preferred_sources'])
+        from main import require_package
         
-        if sources_data.get('sources_by_state'):
-            for state, state_data in sources_data['sources_by_state'].items():
-                if state_data.get('materials'):
-                    total_sources += len(state_data['materials'])
-                if state_data.get('equipment'):
-                    total_sources += len(state_data['equipment'])
+        if not require_package('utils.scraper'):
+            return 1
         
-        if sources_data.get('national_suppliers'):
-            if sources_data['national_suppliers'].get('materials'):
-                total_sources += len(sources_data['national_suppliers']['materials'])
-            if sources_data['national_suppliers'].get('equipment'):
-                total_sources += len(sources_data['national_suppliers']['equipment'])
+        # Imported here so --help and --dry-run do not pay for aiohttp/bs4
+        from utils.scraper import CannabisSourceScraper
         
+        scraper = CannabisSourceScraper(args.sources_file)
+        total_sources = count_loaded_sources(scraper.sources_data)
+        max_concurrent = effective_max_concurrent(args.max_concurrent, total_sources)
+        print(f"Max concurrent: {max_concurrent}")
+        print()
         print(f"Found {total_sources} sources to scrape")
         print()
         
-        if args.dry_run:
-            print("DRY RUN MODE - No actual scraping will be performed")
-            print("Sources that would be scraped:")
-            
-            # Show sources that would be scraped
-            if sources_data.get('preferred_sources'):
-                print("\nPreferred Sources:")
-                for source in sources_data['preferred_sources']:
-                    print(f"  ⭐ {source['name']} - {source['url']}")
-            
-            if sources_data.get('sources_by_state'):
-                print("\nState Sources:")
-                for state, state_data in sources_data['sources_by_state'].items():
-                    print(f"\n  {state.upper()}:")
-                    if state_data.get('materials'):
-                        for source in state_data['materials']:
-                            print(f"    📦 {source['name']} - {source['url']}")
-                    if state_data.get('equipment'):
-                        for source in state_data['equipment']:
-                            print(f"    🔧 {source['name']} - {source['url']}")
-            
-            return
-        
         # Start scraping
         print("Starting scraping process...")
-        start_time = datetime.now()
-        
-        results = await scraper.scrape_all_sources(max_concurrent=args.max_concurrent)
+        start_ns = time.perf_counter_ns()
+
+        results = await scraper.scrape_all_sources(max_concurrent=max_concurrent)
         
-        end_time = datetime.now()
-        duration = end_time - start_time
+        duration_s = (time.perf_counter_ns() - start_ns) / 1e9
         
         # Display results
         print("\n" + "=" * 50)
@@ -90,7 +159,7 @@ async def scrape_sources(args):
         print(f"Successful scrapes: {results['successful_scrapes']}")
         print(f"Failed scrapes: {results['failed_scrapes']}")
         print(f"Success rate: {(results['successful_scrapes'] / results['total_sources'] * 100):.1f}%")
-        print(f"Duration: {duration}")
+        print(f"Duration: {duration_s:.2f}s")
         print()
         
         if results['successful_scrapes'] > 0:
@@ -128,7 +197,8 @@ async def scrape_sources(args):
         print(f"\n❌ Error during scraping: {e}")
         return 1
     finally:
-        await scraper.close_session()
+        if scraper is not None:
+            await scraper.close_session()
     
     return 0
 
@@ -148,15 +218,15 @@ Examples:
     
     parser.add_argument(
         '--sources-file',
-        default='sources/sources.json',
+        default=str(_SOURCES_FILE),
         help='Path to sources JSON file (default: sources/sources.json)'
     )
     
     parser.add_argument(
         '--max-concurrent',
         type=int,
-        default=5,
-        help='Maximum concurrent requests (default: 5)'
+        default=default_max_concurrent(),
+        help=f'Maximum concurrent requests (default: {DEFAULT_MAX_CONCURRENT}, lower if the open file limit is tight)'
     )
     
     parser.add_argument(